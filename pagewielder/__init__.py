@@ -2,4 +2,5 @@
 
 from .core import Dimensions as Dimensions
 from .core import Pages as Pages
+from .core import filter_by_dimensions as filter_by_dimensions
 from .core import map_dimensions_to_pages as map_dimensions_to_pages
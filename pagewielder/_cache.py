@@ -0,0 +1,120 @@
+"""On-disk cache of page dimension maps."""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+from .core import Dimensions, Pages
+
+# Bump this when the format of cached entries changes.
+_VERSION = 1
+
+
+def _cache_dir() -> Path:
+    """Get the directory in which cache entries are stored.
+
+    Returns:
+        The cache directory.
+    """
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+    return base / "pagewielder"
+
+
+def _entry_path(path: Path) -> Path:
+    """Get the path of the cache entry for a PDF file.
+
+    Args:
+        path: Path to a PDF file.
+
+    Returns:
+        The path of the cache entry.
+    """
+    digest = hashlib.sha256(str(path.resolve()).encode()).hexdigest()
+    return _cache_dir() / f"{digest}.json"
+
+
+def stamp(path: Path) -> list[int]:
+    """Get the modification time and size of a file.
+
+    Take the stamp before reading the file, so that changes made while it is
+    being read make the saved entry stale.
+
+    Args:
+        path: Path to a file.
+
+    Returns:
+        The modification time in nanoseconds and the size in bytes.
+    """
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _is_int_list(value: Any) -> bool:
+    """Check whether a decoded JSON value is a list of integers.
+
+    Args:
+        value: A decoded JSON value.
+
+    Returns:
+        True if the value is a list of integers.
+    """
+    return isinstance(value, list) and all(isinstance(item, int) for item in value)
+
+
+def load(path: Path) -> Optional[dict[Dimensions, Pages]]:
+    """Load the cached dimension map for a PDF file.
+
+    Args:
+        path: Path to a PDF file.
+
+    Returns:
+        The cached dimension map, or None if there is no usable entry or the
+        file has changed since the entry was saved.
+    """
+    try:
+        with open(_entry_path(path), encoding="utf-8") as f:
+            entry = json.load(f)
+        if not isinstance(entry, dict) or entry.get("version") != _VERSION or entry["stamp"] != stamp(path):
+            return None
+        ret: dict[Dimensions, Pages] = {}
+        for dimensions, pages in entry["dimensions"]:
+            if not _is_int_list(dimensions) or len(dimensions) != 2 or not _is_int_list(pages):
+                return None
+            ret[(dimensions[0], dimensions[1])] = pages
+        return ret
+    except (OSError, KeyError, TypeError, ValueError):
+        return None
+
+
+def save(path: Path, file_stamp: list[int], dimensions_to_pages: dict[Dimensions, Pages]) -> None:
+    """Save the dimension map for a PDF file.
+
+    Failure to write the cache is not an error.
+
+    Args:
+        path: Path to a PDF file.
+        file_stamp: The stamp of the file, taken before it was read.
+        dimensions_to_pages: A dictionary mapping page dimensions to the pages
+            with those dimensions.
+    """
+    entry_path = _entry_path(path)
+    try:
+        entry: dict[str, Any] = {
+            "version": _VERSION,
+            "stamp": file_stamp,
+            "dimensions": [[list(dimensions), pages] for dimensions, pages in dimensions_to_pages.items()],
+        }
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=entry_path.parent, delete=False) as f:
+            json.dump(entry, f)
+        try:
+            os.replace(f.name, entry_path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+    except OSError:
+        pass
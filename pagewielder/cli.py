@@ -1,16 +1,17 @@
 """Command-line interface for pagewielder."""
 
 import argparse
+import contextlib
+import itertools
+import os
 import sys
 import tempfile
 from argparse import Namespace
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import Iterator, Optional, Sequence
 
-import pikepdf
-
-from . import core, version
+from . import _cache, core, version
 from .core import Dimensions, Pages
 
 
@@ -26,23 +27,22 @@ class Prompt:
 
 def select_dimensions(dimensions_to_pages: dict[Dimensions, Pages]) -> Optional[set[Dimensions]]:
     """Prompt the user to one or more dimensions from a list of dimensions and
-    the corresponding number of pages.
+    the corresponding number of pages, listed from most to fewest pages.
 
     Args:
-        dimensions_to_pages: A dictionary mapping dimensions to the set of
-            pages with those dimensions.
+        dimensions_to_pages: A dictionary mapping dimensions to the pages
+            with those dimensions.
 
     Returns:
         A set of dimensions to remove or None if the user cancels.
     """
-    dimensions_list = list(dimensions_to_pages.keys())
-
-    print(Prompt.AVAILABLE_DIMENSIONS)
+    items = sorted(dimensions_to_pages.items(), key=lambda item: len(item[1]), reverse=True)
+    dimensions_list = [dimensions for dimensions, _ in items]
 
-    for i, dimensions in enumerate(dimensions_list):
-        width, height = dimensions
-        num_pages = len(dimensions_to_pages[dimensions])
-        print(f"{i}: {width:.2f} x {height:.2f} ({num_pages} pages)")
+    lines = [Prompt.AVAILABLE_DIMENSIONS + "\n"]
+    for i, ((width, height), pages) in enumerate(items):
+        lines.append(f"{i}: {width / 10:.1f} x {height / 10:.1f} ({len(pages)} pages)\n")
+    sys.stdout.write("".join(lines))
 
     while True:
         user_input = input(Prompt.SELECT_DIMENSIONS)
@@ -55,6 +55,167 @@ def select_dimensions(dimensions_to_pages: dict[Dimensions, Pages]) -> Optional[
             print(Prompt.INVALID_INPUT)
 
 
+def _parse_dimensions(value: str) -> Dimensions:
+    """Parse page dimensions given on the command line as WIDTHxHEIGHT, in
+    points.
+
+    Args:
+        value: The string to parse.
+
+    Returns:
+        The parsed dimensions.
+
+    Raises:
+        argparse.ArgumentTypeError: If the string is not valid dimensions.
+    """
+    try:
+        width, height = value.lower().split("x")
+        return (round(float(width) * 10), round(float(height) * 10))
+    except (ValueError, OverflowError) as e:
+        raise argparse.ArgumentTypeError(f"invalid dimensions: {value!r} (expected WIDTHxHEIGHT)") from e
+
+
+def _page_ranges(pages: Sequence[int]) -> list[tuple[int, int]]:
+    """Collapse ascending page numbers into runs of consecutive pages.
+
+    Args:
+        pages: Page numbers in ascending order.
+
+    Returns:
+        A list of (first, last) page number pairs.
+    """
+    ret: list[tuple[int, int]] = []
+    for _, group in itertools.groupby(enumerate(pages), key=lambda pair: pair[1] - pair[0]):
+        run = [page for _, page in group]
+        ret.append((run[0], run[-1]))
+    return ret
+
+
+def _qpdf_path(path: Path) -> str:
+    """Format a path as a qpdf argument.
+
+    Relative paths are prefixed with the current directory so that names
+    starting with "-" or "@" are not read as options or argument files.
+
+    Args:
+        path: A file path.
+
+    Returns:
+        The path as a string.
+    """
+    return str(path) if path.is_absolute() else os.path.join(os.curdir, path)
+
+
+def _qpdf_extract(input_path: Path, output_path: Path, keep_ranges: list[tuple[int, int]], linearize: bool) -> None:
+    """Write a subset of the pages of a PDF file to a new file using a qpdf
+    job.
+
+    The job runs in-process on the libqpdf bundled with pikepdf, so pages are
+    numbered as they are in map_dimensions_to_pages, even in damaged files
+    whose page trees have to be repaired.
+
+    Args:
+        input_path: Path to the input PDF file.
+        output_path: Path to the output PDF file.
+        keep_ranges: A list of (first, last) page number pairs to keep.
+        linearize: Whether to linearize the output file.
+
+    Raises:
+        pikepdf.PikepdfError: If the job fails.
+    """
+    import pikepdf  # pylint: disable=import-outside-toplevel
+
+    range_str = ",".join(str(first) if first == last else f"{first}-{last}" for first, last in keep_ranges)
+    args = ["pikepdf", "--warning-exit-0"]
+    if linearize:
+        args.append("--linearize")
+    args += ["--empty", "--pages", _qpdf_path(input_path), range_str, "--", _qpdf_path(output_path)]
+    pikepdf.Job(args).run()
+
+
+@contextlib.contextmanager
+def _atomic_output(output_path: Path) -> Iterator[Path]:
+    """Provide a temporary path in the same directory as the output path, which
+    is moved into place if the body completes and removed otherwise.
+
+    Args:
+        output_path: Path to the output file.
+
+    Yields:
+        The temporary path to write to.
+    """
+    with tempfile.NamedTemporaryFile(dir=output_path.parent, suffix=".pdf", delete=False) as tmpfile:
+        tmp_path = Path(tmpfile.name)
+    try:
+        # NamedTemporaryFile creates the file as 0600; give the output the
+        # permissions it would have had if created directly.
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        yield tmp_path
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _remove_dimensions(input_path: Path, output_path: Path, remove: set[Dimensions], linearize: bool) -> int:
+    """Remove pages with the given dimensions from a PDF file without prompting.
+
+    Args:
+        input_path: Path to the input PDF file.
+        output_path: Path to the output PDF file.
+        remove: The dimensions of the pages to remove.
+        linearize: Whether to linearize the output file.
+
+    Returns:
+        An exit code.
+    """
+    import pikepdf  # pylint: disable=import-outside-toplevel
+
+    with core.open_pdf(input_path) as input_pdf:
+        with pikepdf.Pdf.new() as output_pdf:
+            kept = core.filter_by_dimensions(input_pdf, output_pdf, remove)
+            if kept == 0:
+                print("Every page matched the given dimensions. No output file created.", file=sys.stderr)
+                return 1
+            if kept == len(input_pdf.pages):
+                print("No page matched the given dimensions. No output file created.", file=sys.stderr)
+                return 1
+            with _atomic_output(output_path) as tmp_path:
+                output_pdf.save(tmp_path, linearize=linearize)
+
+    print(f"Filtered PDF saved as {output_path}")
+
+    return 0
+
+
+def _extract_pages(input_path: Path, output_path: Path, pages: Pages, linearize: bool) -> int:
+    """Write the given pages of a PDF file to the output path.
+
+    Args:
+        input_path: Path to the input PDF file.
+        output_path: Path to the output PDF file.
+        pages: The page numbers to keep, in ascending order.
+        linearize: Whether to linearize the output file.
+
+    Returns:
+        An exit code.
+    """
+    import pikepdf  # pylint: disable=import-outside-toplevel
+
+    try:
+        with _atomic_output(output_path) as tmp_path:
+            _qpdf_extract(input_path, tmp_path, _page_ranges(pages), linearize)
+    except pikepdf.PikepdfError as e:
+        print(f"Could not extract pages from {input_path}: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Filtered PDF saved as {output_path}")
+
+    return 0
+
+
 def filter_command(args: Namespace) -> int:
     """Filter a PDF file based on page dimensions.
 
@@ -65,39 +226,42 @@ def filter_command(args: Namespace) -> int:
         An exit code.
     """
     input_path: Path = args.input
-    output_path: Optional[Path] = None
+    output_path: Path = args.output if args.output is not None else input_path.with_suffix(".filtered.pdf")
 
-    if args.output is not None:
-        output_path = args.output
-    else:
-        with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmpfile:
-            output_path = Path(tmpfile.name)
+    if args.output is None and output_path.exists():
+        print(f"{output_path} already exists. Use -o to overwrite it.", file=sys.stderr)
+        return 1
 
     if input_path == output_path:
         print("Input and output paths must be different.", file=sys.stderr)
         return 1
 
-    with pikepdf.open(input_path) as input_pdf:
-        dimensions_to_pages = core.map_dimensions_to_pages(input_pdf)
-        maybe_selected_dimensions = select_dimensions(dimensions_to_pages)
+    if args.remove is not None:
+        return _remove_dimensions(input_path, output_path, set(args.remove), args.linearize)
 
-        if maybe_selected_dimensions is None:
-            print("No page sets selected. No output file created.", file=sys.stderr)
-            return 1
+    dimensions_to_pages = _cache.load(input_path)
+    if dimensions_to_pages is None:
+        file_stamp = _cache.stamp(input_path)
+        with core.open_pdf(input_path) as input_pdf:
+            dimensions_to_pages = core.map_dimensions_to_pages(input_pdf)
+        _cache.save(input_path, file_stamp, dimensions_to_pages)
+    maybe_selected_dimensions = select_dimensions(dimensions_to_pages)
 
-        selected_pages: Pages = set()
-        for page_dimensions in maybe_selected_dimensions:
-            selected_pages.update(dimensions_to_pages[page_dimensions])
+    if maybe_selected_dimensions is None:
+        print("No page sets selected. No output file created.", file=sys.stderr)
+        return 1
 
-        with pikepdf.Pdf.new() as output_pdf:
-            for i, page in enumerate(input_pdf.pages, start=1):
-                if i not in selected_pages:
-                    output_pdf.pages.append(page)
-            output_pdf.save(output_path)
+    selected_pages = set(itertools.chain.from_iterable(dimensions_to_pages[d] for d in maybe_selected_dimensions))
 
-    print(f"Filtered PDF saved as {output_path}")
+    total_pages = sum(len(pages) for pages in dimensions_to_pages.values())
 
-    return 0
+    if len(selected_pages) == total_pages:
+        print("All pages selected. No output file created.", file=sys.stderr)
+        return 1
+
+    kept_pages = sorted(set(range(1, total_pages + 1)) - selected_pages)
+
+    return _extract_pages(input_path, output_path, kept_pages, args.linearize)
 
 
 def main(args: Sequence[str] = sys.argv[1:]) -> int:
@@ -112,7 +276,18 @@ def main(args: Sequence[str] = sys.argv[1:]) -> int:
 
     filter_parser = subparsers.add_parser("filter", help="Filter PDF pages based on dimensions")
     filter_parser.add_argument("input", type=Path, help="Path to the input PDF file")
-    filter_parser.add_argument("-o", "--output", type=Path, help="Path to the output PDF file (optional)")
+    filter_parser.add_argument(
+        "-o", "--output", type=Path, help="Path to the output PDF file (default: INPUT with a .filtered.pdf suffix)"
+    )
+    filter_parser.add_argument(
+        "-r",
+        "--remove",
+        type=_parse_dimensions,
+        action="append",
+        metavar="WIDTHxHEIGHT",
+        help="Remove pages with these dimensions without prompting (repeatable)",
+    )
+    filter_parser.add_argument("--linearize", action="store_true", help="Linearize the output for fast web viewing")
     filter_parser.set_defaults(func=filter_command)
 
     parsed = parser.parse_args(args)
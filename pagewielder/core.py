@@ -1,24 +1,67 @@
 """Core functionality for pagewielder."""
 
-import collections
+from __future__ import annotations
 
-from pikepdf import Page, Pdf, Rectangle
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
 
-Dimensions = tuple[float, float]
-Pages = set[int]
+# pikepdf is slow to import, so it is only imported when a PDF file is opened.
+if TYPE_CHECKING:
+    from pikepdf import Page, Pdf, Rectangle
 
+# Width and height in tenths of a point, so that sizes differing only by
+# floating-point noise compare equal.
+Dimensions = tuple[int, int]
+Pages = list[int]
 
-def _get_dimensions(page: Page) -> Dimensions:
-    """Get the dimensions of a page in a PDF file.
+# Files at least this large are memory-mapped, which avoids a read syscall for
+# every seek QPDF makes while resolving objects.
+_MMAP_THRESHOLD = 100 * 1024 * 1024
+
+
+def open_pdf(path: Path) -> Pdf:
+    """Open a PDF file for reading, memory-mapping it if it is large.
+
+    Indexing or slicing the returned file's pages costs time linear in the
+    page count, so walk them with an iterator, or copy them to a list once.
 
     Args:
-        page: A page in a PDF file.
+        path: Path to a PDF file.
 
     Returns:
-        The dimensions of the page.
+        The opened PDF file.
     """
-    rect = Rectangle(page.mediabox)
-    return (rect.width, rect.height)
+    import pikepdf  # pylint: disable=import-outside-toplevel
+
+    access_mode = pikepdf.AccessMode.mmap if path.stat().st_size >= _MMAP_THRESHOLD else pikepdf.AccessMode.default
+    return pikepdf.open(path, access_mode=access_mode)
+
+
+def _get_box_dimensions(rect: Rectangle) -> Dimensions:
+    """Get the dimensions of a rectangle in a PDF file.
+
+    Args:
+        rect: A rectangle, such as a page's /MediaBox.
+
+    Returns:
+        The dimensions of the rectangle.
+    """
+    return (round(rect.width * 10), round(rect.height * 10))
+
+
+def _iter_dimensions(pages: Iterable[Page]) -> Iterator[tuple[Page, Dimensions]]:
+    """Get the dimensions of a sequence of pages in a PDF file.
+
+    Args:
+        pages: Pages in a PDF file.
+
+    Yields:
+        (page, dimensions) pairs.
+    """
+    from pikepdf import Rectangle  # pylint: disable=import-outside-toplevel
+
+    for page in pages:
+        yield (page, _get_box_dimensions(Rectangle(page.mediabox)))
 
 
 def map_dimensions_to_pages(pdf: Pdf) -> dict[Dimensions, Pages]:
@@ -28,13 +71,29 @@ def map_dimensions_to_pages(pdf: Pdf) -> dict[Dimensions, Pages]:
         pdf: A PDF file.
 
     Returns:
-        A dictionary mapping page dimensions to the set of pages with those
-        dimensions.
+        A dictionary mapping page dimensions to the pages with those
+        dimensions, in ascending order.
     """
-    ret: dict[Dimensions, Pages] = collections.defaultdict(set)
+    ret: dict[Dimensions, Pages] = {}
 
-    for i, page in enumerate(pdf.pages):
-        dimensions = _get_dimensions(page)
-        ret[dimensions].add(i + 1)
+    for i, (_, dimensions) in enumerate(_iter_dimensions(pdf.pages), start=1):
+        ret.setdefault(dimensions, []).append(i)
 
     return ret
+
+
+def filter_by_dimensions(input_pdf: Pdf, output_pdf: Pdf, remove: set[Dimensions]) -> int:
+    """Copy the pages of a PDF file whose dimensions are not in a given set to
+    another PDF file, in a single pass over the input.
+
+    Args:
+        input_pdf: The PDF file to copy pages from.
+        output_pdf: The PDF file to append the kept pages to.
+        remove: The dimensions of the pages to leave out.
+
+    Returns:
+        The number of pages copied.
+    """
+    kept = [page for page, dimensions in _iter_dimensions(input_pdf.pages) if dimensions not in remove]
+    output_pdf.pages.extend(kept)
+    return len(kept)
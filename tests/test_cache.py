@@ -0,0 +1,88 @@
+"""Tests for pagewielder._cache."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from pagewielder import _cache
+
+DIMENSIONS_TO_PAGES = {(6120, 7920): [1, 3], (5953, 8419): [2]}
+
+
+class TestCache(unittest.TestCase):
+    """Tests for loading and saving cache entries."""
+
+    def setUp(self) -> None:
+        tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(tmpdir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(Path(tmpdir.name) / "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.path = Path(tmpdir.name) / "input.pdf"
+        self.path.write_bytes(b"%PDF-1.7\n")
+
+    def test_miss(self) -> None:
+        """There is no entry for a file that was never saved."""
+        self.assertIsNone(_cache.load(self.path))
+
+    def test_round_trip(self) -> None:
+        """A saved entry is loaded back unchanged."""
+        _cache.save(self.path, _cache.stamp(self.path), DIMENSIONS_TO_PAGES)
+        self.assertEqual(_cache.load(self.path), DIMENSIONS_TO_PAGES)
+
+    def test_stale_after_size_change(self) -> None:
+        """An entry is ignored once the file's size changes."""
+        _cache.save(self.path, _cache.stamp(self.path), DIMENSIONS_TO_PAGES)
+        st = self.path.stat()
+        self.path.write_bytes(b"%PDF-1.7\n%%EOF\n")
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        self.assertIsNone(_cache.load(self.path))
+
+    def test_stale_after_mtime_change(self) -> None:
+        """An entry is ignored once the file's mtime changes."""
+        _cache.save(self.path, _cache.stamp(self.path), DIMENSIONS_TO_PAGES)
+        st = self.path.stat()
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(_cache.load(self.path))
+
+    def test_malformed_entries(self) -> None:
+        """Unreadable or malformed entries are treated as a miss."""
+        entry_path = Path(os.environ["XDG_CACHE_HOME"]) / "pagewielder"
+        _cache.save(self.path, _cache.stamp(self.path), DIMENSIONS_TO_PAGES)
+        (entry,) = entry_path.iterdir()
+        for content in ["", "{}", '{"stamp": []}', "[]", "1"]:
+            with self.subTest(content=content):
+                entry.write_text(content, encoding="utf-8")
+                self.assertIsNone(_cache.load(self.path))
+
+    def test_malformed_dimensions(self) -> None:
+        """Entries whose dimensions or page lists are not integers are treated as a miss."""
+        entry_path = Path(os.environ["XDG_CACHE_HOME"]) / "pagewielder"
+        _cache.save(self.path, _cache.stamp(self.path), DIMENSIONS_TO_PAGES)
+        (entry,) = entry_path.iterdir()
+        header = {"version": 1, "stamp": _cache.stamp(self.path)}
+        for dimensions in [
+            [[[6120, 7920], 5]],
+            [[[6120, 7920], ["1"]]],
+            [[[6120], [1]]],
+            [[[6120, 7920, 1], [1]]],
+            [[[6120.5, 7920], [1]]],
+            [[{}, [1]]],
+        ]:
+            with self.subTest(dimensions=dimensions):
+                entry.write_text(json.dumps({**header, "dimensions": dimensions}), encoding="utf-8")
+                self.assertIsNone(_cache.load(self.path))
+
+    def test_stamp_taken_before_reading(self) -> None:
+        """An entry saved with a stamp taken before the file changed is stale."""
+        file_stamp = _cache.stamp(self.path)
+        self.path.write_bytes(b"%PDF-1.7\n%%EOF\n")
+        _cache.save(self.path, file_stamp, DIMENSIONS_TO_PAGES)
+        self.assertIsNone(_cache.load(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
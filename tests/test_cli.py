@@ -0,0 +1,182 @@
+"""Tests for pagewielder.cli."""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pikepdf
+
+from pagewielder import cli
+from pagewielder.cli import _extract_pages, _page_ranges, _parse_dimensions, _qpdf_extract, _qpdf_path
+
+SIZES = [(100.0, 100.0), (200.0, 200.0), (300.0, 300.0), (400.0, 400.0)]
+
+
+def make_pdf(path: Path) -> None:
+    """Write a PDF file with one blank page of each of SIZES."""
+    with pikepdf.Pdf.new() as pdf:
+        for size in SIZES:
+            pdf.add_blank_page(page_size=size)
+        pdf.save(path)
+
+
+def page_widths(path: Path) -> list[float]:
+    """Get the widths of the pages of a PDF file."""
+    with pikepdf.open(path) as pdf:
+        return [float(pikepdf.Rectangle(page.mediabox).width) for page in pdf.pages]
+
+
+class TestPageRanges(unittest.TestCase):
+    """Tests for _page_ranges."""
+
+    def test_empty(self) -> None:
+        """An empty list has no runs."""
+        self.assertEqual(_page_ranges([]), [])
+
+    def test_single_page(self) -> None:
+        """A single page is a run of its own."""
+        self.assertEqual(_page_ranges([4]), [(4, 4)])
+
+    def test_runs(self) -> None:
+        """Consecutive pages are collapsed into runs."""
+        self.assertEqual(_page_ranges([1, 2, 3, 5, 7, 8]), [(1, 3), (5, 5), (7, 8)])
+
+
+class TestParseDimensions(unittest.TestCase):
+    """Tests for _parse_dimensions."""
+
+    def test_valid(self) -> None:
+        """Sizes in points are quantized to tenths of a point."""
+        self.assertEqual(_parse_dimensions("612x792"), (6120, 7920))
+        self.assertEqual(_parse_dimensions("595.28X841.89"), (5953, 8419))
+
+    def test_invalid(self) -> None:
+        """Malformed or non-finite sizes are rejected."""
+        for value in ["", "612", "612x", "x792", "1x2x3", "axb", "infx1", "1e400x1"]:
+            with self.subTest(value=value):
+                with self.assertRaises(argparse.ArgumentTypeError):
+                    _parse_dimensions(value)
+
+
+class TestQpdfPath(unittest.TestCase):
+    """Tests for _qpdf_path."""
+
+    def test_relative(self) -> None:
+        """Relative paths cannot be read as options or argument files."""
+        self.assertEqual(Path(_qpdf_path(Path("-in.pdf"))), Path("./-in.pdf"))
+        self.assertFalse(_qpdf_path(Path("@args")).startswith("@"))
+
+    def test_absolute(self) -> None:
+        """Absolute paths are passed through unchanged."""
+        path = Path("/tmp/-in.pdf").absolute()
+        self.assertEqual(_qpdf_path(path), str(path))
+
+
+class TestQpdfExtract(unittest.TestCase):
+    """Tests for _qpdf_extract and _extract_pages."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        self.input_path = Path(self.tmpdir.name) / "input.pdf"
+        self.output_path = Path(self.tmpdir.name) / "output.pdf"
+        make_pdf(self.input_path)
+
+    def test_job_arguments(self) -> None:
+        """The page ranges and paths are passed to a qpdf job."""
+        for linearize, options in [(False, []), (True, ["--linearize"])]:
+            with self.subTest(linearize=linearize), mock.patch("pikepdf.Job") as job:
+                _qpdf_extract(Path("-in.pdf"), self.output_path, [(1, 2), (4, 4)], linearize)
+                job.assert_called_once_with(
+                    ["pikepdf", "--warning-exit-0", *options]
+                    + ["--empty", "--pages", "./-in.pdf", "1-2,4", "--", str(self.output_path)]
+                )
+                job.return_value.run.assert_called_once_with()
+
+    def test_extracts_pages(self) -> None:
+        """Only the given pages are written, in order."""
+        _qpdf_extract(self.input_path, self.output_path, [(1, 2), (4, 4)], linearize=False)
+        self.assertEqual(page_widths(self.output_path), [100.0, 200.0, 400.0])
+
+    def test_failure(self) -> None:
+        """A failed job is reported without leaving an output file behind."""
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            self.assertEqual(_extract_pages(self.input_path, self.output_path, [1, 5], linearize=False), 1)
+        self.assertIn("Could not extract pages", stderr.getvalue())
+        self.assertEqual(sorted(path.name for path in Path(self.tmpdir.name).iterdir()), ["input.pdf"])
+
+
+class TestFilterCommand(unittest.TestCase):
+    """Tests for the filter command."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        patcher = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": str(Path(self.tmpdir.name) / "cache")})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.input_path = Path(self.tmpdir.name) / "input.pdf"
+        self.output_path = Path(self.tmpdir.name) / "output.pdf"
+        make_pdf(self.input_path)
+
+    def run_filter(self, *args: str, user_input: str = "") -> int:
+        """Run the filter command on the test file, answering any prompt with user_input."""
+        with (
+            contextlib.redirect_stdout(io.StringIO()),
+            contextlib.redirect_stderr(io.StringIO()),
+            mock.patch("builtins.input", return_value=user_input),
+        ):
+            return cli.main(["filter", str(self.input_path), *args])
+
+    def test_remove(self) -> None:
+        """Pages with the given dimensions are removed without prompting."""
+        self.assertEqual(self.run_filter("-o", str(self.output_path), "-r", "100x100", "-r", "300x300"), 0)
+        self.assertEqual(page_widths(self.output_path), [200.0, 400.0])
+
+    def test_remove_no_match(self) -> None:
+        """No file is written when no page has the given dimensions."""
+        self.assertEqual(self.run_filter("-o", str(self.output_path), "-r", "1x1"), 1)
+        self.assertFalse(self.output_path.exists())
+
+    def test_remove_all(self) -> None:
+        """No file is written when every page has the given dimensions."""
+        sizes = ["100x100", "200x200", "300x300", "400x400"]
+        self.assertEqual(self.run_filter("-o", str(self.output_path), *(f"-r{size}" for size in sizes)), 1)
+        self.assertFalse(self.output_path.exists())
+
+    def test_select(self) -> None:
+        """Pages with the selected dimensions are removed."""
+        self.assertEqual(self.run_filter("-o", str(self.output_path), user_input="0,2"), 0)
+        self.assertEqual(page_widths(self.output_path), [200.0, 400.0])
+
+    def test_select_cancelled(self) -> None:
+        """No file is written when the selection is cancelled."""
+        self.assertEqual(self.run_filter("-o", str(self.output_path)), 1)
+        self.assertFalse(self.output_path.exists())
+
+    def test_select_all(self) -> None:
+        """No file is written when every page is selected."""
+        self.assertEqual(self.run_filter("-o", str(self.output_path), user_input="0,1,2,3"), 1)
+        self.assertFalse(self.output_path.exists())
+
+    def test_default_output_exists(self) -> None:
+        """An existing file at the default output path is not overwritten."""
+        default_path = self.input_path.with_suffix(".filtered.pdf")
+        default_path.write_bytes(b"existing")
+        self.assertEqual(self.run_filter("-r", "100x100"), 1)
+        self.assertEqual(default_path.read_bytes(), b"existing")
+
+    def test_same_input_and_output(self) -> None:
+        """The input file is not used as the output file."""
+        self.assertEqual(self.run_filter("-o", str(self.input_path), "-r", "100x100"), 1)
+        self.assertEqual(page_widths(self.input_path), [100.0, 200.0, 300.0, 400.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Tests for pagewielder.core."""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+import pikepdf
+
+from pagewielder import core
+
+LETTER = (612.0, 792.0)
+A4 = (595.28, 841.89)
+
+
+def make_pdf(path: Path, sizes: list[tuple[float, float]]) -> None:
+    """Write a PDF file with one blank page of each of the given sizes."""
+    with pikepdf.Pdf.new() as pdf:
+        for size in sizes:
+            pdf.add_blank_page(page_size=size)
+        pdf.save(path)
+
+
+class TestMapDimensionsToPages(unittest.TestCase):
+    """Tests for map_dimensions_to_pages."""
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = Path(self.tmpdir.name) / "input.pdf"
+
+    def map_dimensions_to_pages(self) -> dict[core.Dimensions, core.Pages]:
+        """Open the test file and map its page dimensions."""
+        with core.open_pdf(self.path) as pdf:
+            return core.map_dimensions_to_pages(pdf)
+
+    def test_groups_pages_by_dimensions(self) -> None:
+        """Pages are grouped by size, in ascending page order."""
+        make_pdf(self.path, [LETTER, A4, LETTER, LETTER, A4])
+        self.assertEqual(self.map_dimensions_to_pages(), {(6120, 7920): [1, 3, 4], (5953, 8419): [2, 5]})
+
+    def test_quantizes_dimensions(self) -> None:
+        """Sizes differing by less than a tenth of a point share a group."""
+        make_pdf(self.path, [(612.0, 792.0), (612.04, 791.99)])
+        self.assertEqual(self.map_dimensions_to_pages(), {(6120, 7920): [1, 2]})
+
+    def test_empty(self) -> None:
+        """A file with no pages maps to nothing."""
+        make_pdf(self.path, [])
+        self.assertEqual(self.map_dimensions_to_pages(), {})
+
+
+class TestFilterByDimensions(unittest.TestCase):
+    """Tests for filter_by_dimensions."""
+
+    def test_removes_matching_pages(self) -> None:
+        """Pages with the given sizes are left out of the output."""
+        with pikepdf.Pdf.new() as input_pdf, pikepdf.Pdf.new() as output_pdf:
+            for size in [LETTER, A4, LETTER, A4]:
+                input_pdf.add_blank_page(page_size=size)
+            self.assertEqual(core.filter_by_dimensions(input_pdf, output_pdf, {(5953, 8419)}), 2)
+            self.assertEqual(len(output_pdf.pages), 2)
+            self.assertEqual([list(page.mediabox) for page in output_pdf.pages], [[0, 0, 612, 792]] * 2)
+
+    def test_no_matching_pages(self) -> None:
+        """All pages are copied when none match."""
+        with pikepdf.Pdf.new() as input_pdf, pikepdf.Pdf.new() as output_pdf:
+            input_pdf.add_blank_page(page_size=LETTER)
+            self.assertEqual(core.filter_by_dimensions(input_pdf, output_pdf, {(1, 1)}), 1)
+            self.assertEqual(len(output_pdf.pages), 1)
+
+    def test_all_matching_pages(self) -> None:
+        """Nothing is copied when every page matches."""
+        with pikepdf.Pdf.new() as input_pdf, pikepdf.Pdf.new() as output_pdf:
+            input_pdf.add_blank_page(page_size=LETTER)
+            self.assertEqual(core.filter_by_dimensions(input_pdf, output_pdf, {(6120, 7920)}), 0)
+            self.assertEqual(len(output_pdf.pages), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()